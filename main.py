@@ -11,27 +11,28 @@ for easy translation.
 
 import tkinter as tk
 from tkinter import ttk
-import gettext
+import locale
 import os
 import sys  # Make sure this import is added
+import threading
 
 # Import the printing function from our printer module.
-from printer import print_labels
+from printer import PrintResult, print_labels
 
 # --- Helper function for PyInstaller asset paths ---
 # This function is crucial for the .exe to find the asset files.
+
+# The folder that contains the asset files. It never changes while the
+# program runs, so we work it out only once.
+# When running as a bundled executable, PyInstaller creates a temp folder
+# and stores its path in sys._MEIPASS. In a normal Python environment,
+# we use the directory of the script file.
+_BASE_PATH = getattr(sys, '_MEIPASS', None) or os.path.abspath(os.path.dirname(__file__))
+
+
 def resource_path(relative_path):
     """ Get absolute path to resource, works for dev and for PyInstaller """
-    # Check if the script is running as a bundled executable
-    if hasattr(sys, '_MEIPASS'):
-        # PyInstaller creates a temp folder and stores its path in _MEIPASS
-        base_path = sys._MEIPASS
-    else:
-        # We are running in a normal Python environment
-        # Use the directory of the script file
-        base_path = os.path.abspath(os.path.dirname(__file__))
-
-    return os.path.join(base_path, relative_path)
+    return os.path.join(_BASE_PATH, relative_path)
 
 
 # --- Internationalization (i18n) Setup ---
@@ -42,17 +43,76 @@ APP_NAME = "messages"
 # The LOCALE_DIR should point to the directory where the 'locale' folder is.
 LOCALE_DIR = resource_path("locale")
 
-# Set up gettext
-# This tells gettext where to find the translation files.
-try:
-    fr_translation = gettext.translation(APP_NAME, localedir=LOCALE_DIR, languages=['fr'])
-    fr_translation.install()
-    _ = fr_translation.gettext
-except FileNotFoundError:
-    # Fallback to a dummy function if translation file is not found.
-    # This way, the app will still run, but in English (the source language).
-    print("Translation file not found. Running in default language.")
-    _ = lambda s: s
+# Reading the translation file takes a moment, so it is not done when the
+# program starts. Until 'load_translations' has been called, '_' simply
+# returns the English text (the source language) unchanged.
+_ = lambda s: s
+
+
+def N_(message):
+    """
+    Mark a string as translatable without translating it yet.
+
+    This lets the translation tools find the string, while the actual
+    translation is done later with '_' (this is gettext's "gettext_noop").
+    """
+    return message
+
+
+def is_english_locale():
+    """
+    Return True only if the user's language is explicitly set to English.
+
+    A computer with no language set (empty, 'C' or 'POSIX') is not treated
+    as English, so it keeps the French interface.
+    """
+    if sys.platform == "win32":
+        # On Windows, the name looks like 'English_United States'.
+        language = locale.getlocale()[0] or ""
+    else:
+        # On Linux and macOS, we read the same settings as gettext itself,
+        # in the same order, and use the first one that is set.
+        # The name looks like 'en_US.UTF-8'. LANGUAGE can hold a list of
+        # languages separated by ':', in which case the first one counts.
+        language = ""
+        for name in ("LANGUAGE", "LC_ALL", "LC_MESSAGES", "LANG"):
+            value = os.environ.get(name)
+            if value:
+                language = value.split(":")[0]
+                break
+    return language.lower().startswith("en")
+
+
+def load_translations():
+    """
+    Load the French translation and make '_' use it.
+
+    Returns True if the translation was loaded, False if the application
+    stays in English (the source language).
+    """
+    global _
+    # The texts are written in English, so on an English computer there is
+    # nothing to translate and the translation file does not need to be read.
+    if is_english_locale():
+        return False
+
+    # The gettext module is only needed here, so it is imported here too,
+    # which keeps it out of the program's start-up.
+    import gettext
+
+    # Set up gettext
+    # This tells gettext where to find the translation files.
+    # We keep the translation's own 'gettext' method as '_' in this module,
+    # instead of calling install(), which would add '_' to Python's builtins.
+    try:
+        fr_translation = gettext.translation(APP_NAME, localedir=LOCALE_DIR, languages=['fr'])
+        _ = fr_translation.gettext
+    except FileNotFoundError:
+        # Keep the dummy function if translation file is not found.
+        # This way, the app will still run, but in English (the source language).
+        print("Translation file not found. Running in default language.")
+        return False
+    return True
 
 
 class Application(tk.Frame):
@@ -64,57 +124,141 @@ class Application(tk.Frame):
     def __init__(self, master=None):
         super().__init__(master)
         self.master = master
-        self.master.title(_("Label Printer"))
-        
-        # Set the application icon using the resource_path helper function.
-        self.master.iconbitmap(resource_path('assets/icon.ico'))
-        
+
         self.master.resizable(False, False) # Make window not resizable
-        self.pack(padx=20, pady=20)
         self.create_widgets()
+        self.translate_texts()
 
-    def create_widgets(self):
-        """Create and arrange all the widgets in the window."""
+        # Only now that every widget exists and has its text, we place them
+        # in the window, so the layout is worked out in a single pass.
+        self.layout_widgets()
+        self.pack(padx=20, pady=20)
+
+        # Reading the icon and the picture from disk can be slow (for example
+        # when the .exe first unpacks its files), so we do it only once the
+        # window has been drawn.
+        self.master.after_idle(self._load_images)
+
+    def _load_images(self):
+        """Load the window icon and the picture shown at the top."""
+        # Set the application icon using the resource_path helper function.
+        self.master.iconbitmap(resource_path('assets/icon.ico'))
 
-        # --- Image Display ---
         # Load the image from file using the resource_path helper function.
         # We must keep a reference to this image object in the class instance;
         # otherwise, Python's garbage collector will discard it.
         self.image = tk.PhotoImage(file=resource_path('assets/picture.png'))
-        self.image_label = ttk.Label(self, image=self.image)
-        self.image_label.pack(pady=(0, 10))
+        self.image_label.configure(image=self.image)
+
+    def install_translations(self):
+        """
+        Load the translations and show them in the window.
+
+        This is called once the window is already on screen, so the user
+        does not have to wait for the translation file to be read.
+        """
+        # If nothing was loaded, the window already shows the right texts.
+        if load_translations():
+            self.translate_texts()
+
+    def translate_texts(self):
+        """
+        Translate all the text of the window.
+
+        The status messages are shown again and again while the application
+        is used, so we look up their translation only once and keep the result.
+        """
+        self.master.title(_("Label Printer"))
+
+        for widget, message in self._widget_texts:
+            widget.configure(text=_(message))
+        self._status_var.set(_("Enter a number and click Print."))
+
+        self._msg_invalid_number = _("Error: Please enter a positive whole number.")
+        self._msg_sending = _("Sending to printer...")
+        # This one contains a '{}' placeholder for the number of labels.
+        self._msg_success_tmpl = _("Successfully sent print job for {} labels.")
+        # The message to show for each kind of error returned by print_labels.
+        self._error_messages = {
+            PrintResult.TIMEOUT: _("Error: Connection timed out. Check printer IP and network."),
+            PrintResult.SOCKET_ERROR: _("Error: A network error occurred."),
+            PrintResult.UNKNOWN: _("Error: An unexpected error occurred."),
+        }
+
+        # The title and the lines of text of the 'About' window.
+        # An empty string is shown as a blank line.
+        self._about_title = _("About Label Printer")
+        self._about_lines = (
+            _("Label Printer v1.0"),
+            _("Developed by: MathBach32"),
+            "",
+            _("For any bug or suggestion, contact:"),
+            _("mathieu.bachmann@outlook.com"),
+            "",
+            _("This software is distributed under the"),
+            _("Creative Commons BY-NC-SA 4.0 license."),
+        )
+
+    def create_widgets(self):
+        """Create all the widgets of the window (they are placed by 'layout_widgets')."""
+
+        # --- Image Display ---
+        # The picture itself is loaded later, by '_load_images'.
+        self.image_label = ttk.Label(self)
 
         # --- Input Section ---
         # A label and an entry field for the user to type the number of labels.
-        self.input_label = ttk.Label(self, text=_("Number of labels to print:"))
-        self.input_label.pack(pady=(0, 5))
+        self.input_label = ttk.Label(self)
 
         # The Entry widget is where the user types the number.
         self.number_entry = ttk.Entry(self, width=15, justify='center')
-        self.number_entry.pack(pady=(0, 10))
-        # Set focus on the entry field so the user can start typing immediately.
-        self.number_entry.focus()
 
         # --- Print Button ---
         # The button that starts the printing process.
         # The 'command' option is set to our printing function.
-        self.print_button = ttk.Button(self, text=_("Print"), command=self.start_printing)
-        self.print_button.pack(pady=(5, 10))
+        self.print_button = ttk.Button(self, command=self.start_printing)
 
         # --- Status Label ---
         # A label to provide feedback to the user (e.g., "Printing...", "Done.").
-        self.status_label = ttk.Label(self, text=_("Enter a number and click Print."), wraplength=300)
-        self.status_label.pack(pady=(10, 0))
+        # The label shows the content of '_status_var': changing the text is
+        # then just a call to self._status_var.set(...).
+        self._status_var = tk.StringVar(self)
+        self.status_label = ttk.Label(self, textvariable=self._status_var, wraplength=300)
 
         # --- About Link ---
-        self.about_label = ttk.Label(self, text=_("About"), cursor="hand2", foreground="blue")
-        self.about_label.pack(pady=(10, 0))
+        self.about_label = ttk.Label(self, cursor="hand2", foreground="blue")
         self.about_label.bind("<Button-1>", self.show_about_window)
 
+        # --- Widget Texts ---
+        # The text shown by each widget, in English. The texts are set (and
+        # translated) by 'translate_texts'.
+        self._widget_texts = (
+            (self.input_label, N_("Number of labels to print:")),
+            (self.print_button, N_("Print")),
+            (self.about_label, N_("About")),
+        )
+
+    def layout_widgets(self):
+        """Arrange all the widgets in the window, from top to bottom."""
+        # Each widget with its vertical spacing: (space above, space below).
+        layout = (
+            (self.image_label, (0, 10)),
+            (self.input_label, (0, 5)),
+            (self.number_entry, (0, 10)),
+            (self.print_button, (5, 10)),
+            (self.status_label, (10, 0)),
+            (self.about_label, (10, 0)),
+        )
+        for widget, pady in layout:
+            widget.pack(pady=pady)
+
+        # Set focus on the entry field so the user can start typing immediately.
+        self.number_entry.focus()
+
     def show_about_window(self, event=None):
         """Displays the 'About' window with application information."""
         about_win = tk.Toplevel(self.master)
-        about_win.title(_("About Label Printer"))
+        about_win.title(self._about_title)
         about_win.resizable(False, False)
 
         # Center the about window on the parent window
@@ -128,14 +272,8 @@ class Application(tk.Frame):
         info_frame = ttk.Frame(about_win, padding="20")
         info_frame.pack(expand=True, fill="both")
 
-        ttk.Label(info_frame, text=_("Label Printer v1.0")).pack(pady=2)
-        ttk.Label(info_frame, text=_("Developed by: MathBach32")).pack(pady=2)
-        ttk.Label(info_frame, text="").pack(pady=2) # Blank line
-        ttk.Label(info_frame, text=_("For any bug or suggestion, contact:")).pack(pady=2)
-        ttk.Label(info_frame, text=_("mathieu.bachmann@outlook.com")).pack(pady=2)
-        ttk.Label(info_frame, text="").pack(pady=2) # Blank line
-        ttk.Label(info_frame, text=_("This software is distributed under the")).pack(pady=2)
-        ttk.Label(info_frame, text=_("Creative Commons BY-NC-SA 4.0 license.")).pack(pady=2)
+        for line in self._about_lines:
+            ttk.Label(info_frame, text=line).pack(pady=2)
 
     def start_printing(self):
         """
@@ -146,38 +284,64 @@ class Application(tk.Frame):
         input_value = self.number_entry.get()
 
         # --- Input Validation ---
-        if not input_value.isdigit() or int(input_value) <= 0:
+        # Only plain digits 0-9 are accepted: int() on its own would also
+        # allow spaces, signs, underscores ("1_000") and non-ASCII digits.
+        if input_value.isascii() and input_value.isdigit():
+            # Convert the input to an integer.
+            num_to_print = int(input_value)
+        else:
+            num_to_print = 0
+
+        if num_to_print <= 0:
             # If the input is not a positive number, show an error message.
-            self.status_label.config(text=_("Error: Please enter a positive whole number."))
+            self._status_var.set(self._msg_invalid_number)
             return
 
-        # Convert the input to an integer.
-        num_to_print = int(input_value)
-
         # --- Call the Printing Logic ---
         # Update the status to let the user know something is happening.
-        self.status_label.config(text=_("Sending to printer..."))
-        # This forces the GUI to update immediately.
-        self.master.update()
+        self._status_var.set(self._msg_sending)
+        # Disable the button so the same job is not sent twice by accident.
+        self.print_button.config(state="disabled")
+
+        # The network connection can take several seconds (or time out), so we
+        # run it in a background thread. This keeps the window responsive:
+        # the Tkinter event loop continues to redraw and react to the user.
+        # 'daemon=True' means the thread will not keep the program alive if
+        # the user closes the window while a job is still being sent.
+        threading.Thread(target=self._do_print, args=(num_to_print,), daemon=True).start()
+
+    def _do_print(self, num_to_print):
+        """
+        Runs in a background thread and sends the job to the printer.
 
+        Tkinter widgets must only be touched from the main thread, so instead
+        of updating the status label here, we ask the event loop to call
+        '_on_print_done' as soon as possible with the result.
+        """
         # Call the print_labels function from our printer module.
-        success, message = print_labels(num_to_print)
+        success, code, _detail = print_labels(num_to_print)
+        try:
+            self.master.after(0, self._on_print_done, success, code, num_to_print)
+        except (RuntimeError, tk.TclError):
+            # The window was closed while the job was being sent, so there
+            # is no status label left to update.
+            pass
+
+    def _on_print_done(self, success, code, num_to_print):
+        """Called on the main thread once the print job has finished."""
+        # The job is over, so the user can send another one.
+        self.print_button.config(state="normal")
 
         # --- Update Status with Result ---
-        # We check the success flag and the message content to display
+        # We check the success flag and the result code to display
         # a user-friendly, translated message.
         if success:
             # We can make the success message more specific.
-            self.status_label.config(text=_("Successfully sent print job for {} labels.").format(num_to_print))
+            self._status_var.set(self._msg_success_tmpl.format(num_to_print))
         else:
-            # For errors, we can provide translated, generic messages
-            # based on the error type.
-            if "Connection timed out" in message:
-                self.status_label.config(text=_("Error: Connection timed out. Check printer IP and network."))
-            elif "Socket error" in message:
-                self.status_label.config(text=_("Error: A network error occurred."))
-            else:
-                self.status_label.config(text=_("Error: An unexpected error occurred."))
+            # For errors, we show the translated, generic message
+            # that matches the error type.
+            self._status_var.set(self._error_messages[code])
 
 
 # --- Main execution block ---
@@ -188,6 +352,9 @@ if __name__ == "__main__":
     # Create an instance of our application.
     app = Application(master=root)
 
+    # Load the translations as soon as the window has been drawn.
+    root.after_idle(app.install_translations)
+
     # Start the GUI event loop.
     # This keeps the window open and responsive to user actions.
     app.mainloop()
\ No newline at end of file
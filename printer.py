@@ -13,87 +13,312 @@ official command reference, as one could not be located. The code is structured
 to be clear and easily modifiable if adjustments to the commands are needed.
 """
 
+import atexit
+import enum
+import select
 import socket
+import threading
+import time
 
 # Define the printer's network address.
 # IMPORTANT: This should be changed to the actual IP address of the printer.
 PRINTER_IP = "192.168.1.193"
 PRINTER_PORT = 9100
 
+# A connection that has not been used for this many seconds is not reused:
+# a new one is opened instead. If the printer was switched off or unplugged
+# in the meantime, we would otherwise not notice, and the next job would
+# seem to be sent while it is actually lost.
+IDLE_TIMEOUT = 5
+
+# How long to wait (in seconds) for the printer to accept the connection.
+# This is kept short, so an unreachable printer is reported quickly.
+CONNECT_TIMEOUT = 3
+# How long to wait (in seconds) for each batch of labels to be sent. The
+# batches all have about the same size (see _CHUNK_SIZE), so this does not
+# depend on the number of labels: a printer that stops accepting data is
+# reported after this time, even during a very large job.
+SEND_TIMEOUT = 5
+
+class PrintResult(enum.IntEnum):
+    """
+    The outcome of a print job, as returned by print_labels().
+
+    The GUI uses this code to choose which (translated) message to show,
+    instead of looking for words in the English error message.
+    """
+    OK = 0
+    TIMEOUT = 1
+    SOCKET_ERROR = 2
+    UNKNOWN = 3
+
+
+# The commands sent once at the start of every job, to set up the printer,
+# and once at the end, to restore its default settings. Like the label
+# commands below, they are plain ASCII and already encoded as bytes.
+_SETUP_BYTES = (
+    b'SETUP "Media,Media Type,Label (w Gaps)"\n'
+    b'SETUP "Media,Media Size,Width,840"\n'
+    b'SETUP "Print Defs,Print Method,Direct Thermal"\n'
+)
+_END_BYTES = b"DEFAULT\n"
+
+# The commands for one label, already encoded as bytes. Only the number
+# printed by 'PRTXT' changes from one label to the next, so it is left as a
+# '%d' placeholder that is filled in with: _LABEL_TMPL % number
+# The commands are plain ASCII, so no text encoding step is needed later.
+_LABEL_TMPL = (
+    b"CLL\n"
+    b'FONT "IPLFNT34H"\n'
+    b"MAGNIFY 2, 2\n"
+    b"PRPOS 420, 150\n"
+    b"ALIGN 5\n"
+    b'PRTXT "%d"\n'
+    b"PRINTFEED\n"
+)
+
+# Most jobs print a few hundred labels at most, so the commands for the
+# labels numbered up to this limit are formatted once and then reused.
+# The table only grows as far as the jobs printed so far have needed:
+# _label_table[i - 1] holds the commands for label i.
+_PRECOMPUTED_LABELS = 1000
+_label_table = []
+
+# The labels are sent to the printer in batches of about this many bytes.
+# This way the printer can start working while the next labels are still
+# being prepared, and memory use stays small even for a very large N.
+_CHUNK_SIZE = 64 * 1024
+
+
+class _PrinterConnection:
+    """
+    Keeps a single TCP connection to the printer open between print jobs.
+
+    Opening a new connection for every job costs a full network round trip
+    before the first byte can be sent. Instead, we open the connection the
+    first time it is needed and reuse it for the jobs that follow within
+    IDLE_TIMEOUT seconds. An older connection, or one the printer has closed,
+    is replaced by a new one.
+    """
+    def __init__(self):
+        self.sock = None
+        # When the connection was last used, from time.monotonic().
+        self.last_used = 0.0
+        # The lock makes sure two print jobs never write to the socket
+        # at the same time (for example, from two background threads).
+        self.lock = threading.Lock()
+
+    def _connect(self):
+        """Open a new connection to the printer."""
+        # create_connection() works with both IPv4 and IPv6 addresses and
+        # gives up after CONNECT_TIMEOUT seconds. Python sockets are not
+        # inherited by child processes, so they never keep the connection open.
+        s = socket.create_connection((PRINTER_IP, PRINTER_PORT), timeout=CONNECT_TIMEOUT)
+        try:
+            # Send small commands right away instead of waiting to group them.
+            s.setsockopt(socket.IPPROTO_TCP, socket.TCP_NODELAY, 1)
+            # Ask the system to check regularly that the printer is still
+            # there while the connection is idle. Where the system allows it,
+            # the check starts after 1 second of silence and gives up after
+            # 3 unanswered tries, 1 second apart, which is within IDLE_TIMEOUT.
+            s.setsockopt(socket.SOL_SOCKET, socket.SO_KEEPALIVE, 1)
+            for option, value in (("TCP_KEEPIDLE", 1), ("TCP_KEEPINTVL", 1), ("TCP_KEEPCNT", 3)):
+                try:
+                    s.setsockopt(socket.IPPROTO_TCP, getattr(socket, option), value)
+                except (AttributeError, OSError):
+                    # Not available on this system: the default settings apply.
+                    pass
+        except BaseException:
+            s.close()
+            raise
+        self.sock = s
+
+    def _is_dropped(self):
+        """
+        Check whether the printer has closed the connection we kept open.
+
+        A closed connection becomes "readable" and reading from it returns
+        no data. We only peek, so nothing the printer sent is lost.
+        """
+        readable, _, _ = select.select([self.sock], [], [], 0)
+        if not readable:
+            return False
+        try:
+            return self.sock.recv(1, socket.MSG_PEEK) == b""
+        except OSError:
+            return True
+
+    def close(self):
+        """Close the connection, if one is open."""
+        if self.sock is not None:
+            try:
+                self.sock.close()
+            finally:
+                self.sock = None
+
+    def send(self, chunks):
+        """
+        Send every piece of data in 'chunks' to the printer, in order.
+
+        Each chunk may take up to SEND_TIMEOUT seconds to be sent before the
+        job is given up.
+
+        The connection is opened if needed. If a connection that was reused
+        turns out to be broken while sending the first chunk, it is closed
+        and that chunk is sent again once on a fresh connection. Later
+        chunks are never resent, so a label can never be printed twice.
+        """
+        with self.lock:
+            chunks = iter(chunks)
+            first = next(chunks, b"")
+            if self.sock is not None:
+                idle = time.monotonic() - self.last_used
+                if idle > IDLE_TIMEOUT or self._is_dropped():
+                    self.close()
+            reused = self.sock is not None
+            if not reused:
+                self._connect()
+            try:
+                self.sock.settimeout(SEND_TIMEOUT)
+                try:
+                    self.sock.sendall(first)
+                except socket.timeout:
+                    # The printer is not answering: don't try again.
+                    raise
+                except OSError:
+                    # BrokenPipeError, ConnectionResetError, ... are all OSError.
+                    if not reused:
+                        raise
+                    # The old connection was stale: try once more with a new one.
+                    self.close()
+                    self._connect()
+                    self.sock.settimeout(SEND_TIMEOUT)
+                    self.sock.sendall(first)
+
+                # The rest of the job is sent as soon as each chunk is ready.
+                for chunk in chunks:
+                    self.sock.sendall(chunk)
+                self.last_used = time.monotonic()
+            except BaseException:
+                # We don't know how much of the job the printer received, so
+                # start the next job on a clean connection.
+                self.close()
+                raise
+
+
+# The one shared connection used by print_labels().
+_connection = _PrinterConnection()
+
+
+def close_printer():
+    """Close the shared printer connection (called automatically at exit)."""
+    # Don't wait for a job that is still being sent: that could keep the
+    # program open for a long time after the window has been closed.
+    if _connection.lock.acquire(blocking=False):
+        try:
+            _connection.close()
+        finally:
+            _connection.lock.release()
+        return
+
+    # A job is in progress: shut the connection down, so that the job
+    # stops with an error right away instead of blocking the exit.
+    sock = _connection.sock
+    if sock is not None:
+        try:
+            sock.shutdown(socket.SHUT_RDWR)
+        except OSError:
+            pass
+
+
+atexit.register(close_printer)
+
+
+def _get_label_table(n):
+    """Return the ready-made commands for labels 1 to min(n, _PRECOMPUTED_LABELS)."""
+    needed = min(n, _PRECOMPUTED_LABELS)
+    # Only the labels that are still missing from the table are formatted.
+    for i in range(len(_label_table) + 1, needed + 1):
+        _label_table.append(_LABEL_TMPL % i)
+    return _label_table
+
+
+def _iter_commands(n):
+    """
+    Generate the Fingerprint commands to print N labels, in chunks of bytes.
+
+    Every command ends with a newline so the printer executes them one
+    after the other, including the last one.
+
+    All N labels are part of one single job: the setup is sent once, each
+    label only ends with PRINTFEED, and everything goes over the same
+    connection. Printers (and print spoolers) often pause between jobs, so
+    the labels must not be split into one job per label.
+    """
+    # --- Start of Fingerprint Command Block ---
+
+    # 1. Start (once): The setup commands.
+    yield _SETUP_BYTES
+
+    # 2. Middle (in a loop from 1 to N): The printing block.
+    # The labels are collected in a 'bytearray', which can grow in place,
+    # and handed over each time it holds a full chunk.
+    # Labels with a small number are taken from the ready-made table.
+    buf = bytearray()
+    label_table = _get_label_table(n)
+    for i in range(1, n + 1):
+        if i <= _PRECOMPUTED_LABELS:
+            buf += label_table[i - 1]
+        else:
+            buf += _LABEL_TMPL % i
+        if len(buf) >= _CHUNK_SIZE:
+            # sendall() reads the bytes straight from the bytearray, without
+            # copying them, so there is no need to convert it first.
+            yield buf
+            # The chunk has been sent by now, so the buffer can be reused.
+            buf.clear()
+
+    # 3. End (once): The cleanup command.
+    buf += _END_BYTES
+    yield buf
+
+    # --- End of Fingerprint Command Block ---
+
+
 def print_labels(n):
     """
     Connects to the printer and sends the commands to print N labels.
 
-    This function establishes a socket connection to the printer, sends the
-    initial configuration commands, and then loops N times to print a label
+    This function sends the initial configuration commands over the shared
+    printer connection (opening it if needed), and then loops N times to print a label
     with a number from 1 to N.
 
     Args:
         n (int): The number of labels to print.
 
     Returns:
-        tuple: A tuple containing a boolean indicating success and a message.
-               (True, "Successfully printed N labels.")
-               (False, "Error message.")
+        tuple: A tuple containing a boolean indicating success, a
+               PrintResult code and a message with the details.
+               (True, PrintResult.OK, "Successfully sent print job for N labels.")
+               (False, PrintResult.TIMEOUT, "Error message.")
     """
     try:
-        # --- Start of Fingerprint Command Block ---
-
-        # 1. Start (once): The setup commands.
-        setup_commands = [
-            'SETUP "Media,Media Type,Label (w Gaps)"',
-            'SETUP "Media,Media Size,Width,840"',
-            'SETUP "Print Defs,Print Method,Direct Thermal"',
-        ]
-
-        # 2. Middle (in a loop from 1 to N): The printing block.
-        print_commands = []
-        for i in range(1, n + 1):
-            label_commands = [
-                "CLL",
-                'FONT "IPLFNT34H"',
-                "MAGNIFY 2, 2",
-                "PRPOS 420, 150",
-                "ALIGN 5",
-                f'PRTXT "{i}"',
-                "PRINTFEED",
-            ]
-            print_commands.extend(label_commands)
-
-        # 3. End (once): The cleanup command.
-        end_command = ["DEFAULT"]
-
-        # Combine all commands into a single string, separated by newlines.
-        # The printer will execute these commands sequentially.
-        # We add a final newline to ensure the last command is processed.
-        all_commands = setup_commands + print_commands + end_command
-        full_command_string = "\n".join(all_commands) + "\n"
-
-        # --- End of Fingerprint Command Block ---
-
-        # Open a socket connection to the printer.
-        # The 'with' statement ensures the socket is automatically closed.
-        with socket.socket(socket.AF_INET, socket.SOCK_STREAM) as s:
-            # Set a timeout for the connection attempt.
-            s.settimeout(5)
-            s.connect((PRINTER_IP, PRINTER_PORT))
-
-            # Send the command string to the printer.
-            # The string must be encoded to bytes, typically in UTF-8.
-            s.sendall(full_command_string.encode('utf-8'))
+        # Send the commands to the printer over the shared connection.
+        # The connection is opened on the first job and kept for the next ones.
+        _connection.send(_iter_commands(n))
 
         # If we reach here, the commands were sent successfully.
-        return (True, f"Successfully sent print job for {n} labels.")
+        return (True, PrintResult.OK, f"Successfully sent print job for {n} labels.")
 
     except socket.timeout:
         # This error occurs if the printer is not reachable at the given IP/port.
-        return (False, f"Connection timed out. Check printer IP ({PRINTER_IP}) and network.")
+        return (False, PrintResult.TIMEOUT, f"Connection timed out. Check printer IP ({PRINTER_IP}) and network.")
     except socket.error as e:
         # This handles other network-related errors.
-        return (False, f"Socket error: {e}")
+        return (False, PrintResult.SOCKET_ERROR, f"Socket error: {e}")
     except Exception as e:
         # Catch any other unexpected errors.
-        return (False, f"An unexpected error occurred: {e}")
+        return (False, PrintResult.UNKNOWN, f"An unexpected error occurred: {e}")
 
 if __name__ == '__main__':
     # This block allows for direct testing of the printer module.
@@ -104,11 +329,11 @@ if __name__ == '__main__':
     number_of_labels = 3
     print(f"Attempting to print {number_of_labels} labels to {PRINTER_IP}:{PRINTER_PORT}...")
 
-    success, message = print_labels(number_of_labels)
+    success, code, message = print_labels(number_of_labels)
 
     if success:
         print(f"SUCCESS: {message}")
     else:
-        print(f"ERROR: {message}")
+        print(f"ERROR ({code.name}): {message}")
 
     print("--- Test complete ---")